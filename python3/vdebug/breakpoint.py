@@ -15,8 +15,11 @@ class Store:
         num_bps = len(self.breakpoints)
         if num_bps > 0:
             log.Log("Registering %i breakpoints with the debugger" % num_bps)
-        for bp in self.breakpoints.values():
-            res = self.api.breakpoint_set(bp.get_cmd())
+        bps = list(self.breakpoints.values())
+        responses = self.api.breakpoint_set_many(
+            [bp.get_cmd() for bp in bps])
+        for bp, res in zip(bps, responses):
+            res.raise_for_error()
             bp.set_debugger_id(res.get_id())
 
     # Update line-based breakpoints with a dict of IDs and lines
@@ -76,20 +79,31 @@ class Store:
         if id not in self.breakpoints:
             raise error.BreakpointError("No breakpoint matching ID %s" % id)
         log.Log("Removing breakpoint id %s" % id)
-        if self.api is not None:
-            dbg_id = self.breakpoints[id].get_debugger_id()
-            if dbg_id is not None:
-                self.api.breakpoint_remove(dbg_id)
+        self.__remove_from_debugger(self.breakpoints[id])
         self.breakpoints[id].on_remove()
         del self.breakpoints[id]
 
     def clear_breakpoints(self):
-        # We need to copy the keys to a new list, otherwise the for loop
-        # complains when items are removed.
-        for id in list(self.breakpoints.keys()):
-            self.remove_breakpoint_by_id(id)
+        """Remove all breakpoints, taking their signs down with a single
+        UI call."""
+        removed = []
+        try:
+            for id in list(self.breakpoints.keys()):
+                log.Log("Removing breakpoint id %s" % id)
+                self.__remove_from_debugger(self.breakpoints[id])
+                self.breakpoints[id].on_remove(removed)
+                del self.breakpoints[id]
+        finally:
+            if removed:
+                removed[0].ui.remove_breakpoints(removed)
         self.breakpoints = {}
 
+    def __remove_from_debugger(self, breakpoint):
+        if self.api is not None:
+            dbg_id = breakpoint.get_debugger_id()
+            if dbg_id is not None:
+                self.api.breakpoint_remove(dbg_id)
+
     def get_breakpoint_by_id(self, id):
         id = str(id)
         if id not in list(self.breakpoints.keys()):
@@ -144,8 +158,13 @@ class Breakpoint:
         self.enabled = False
         self.ui.disable_breakpoint(self)
 
-    def on_remove(self):
-        self.ui.remove_breakpoint(self)
+    def on_remove(self, removed=None):
+        """Take the breakpoint out of the UI, or append it to the removed
+        list so the caller can take several down at once."""
+        if removed is None:
+            self.ui.remove_breakpoint(self)
+        else:
+            removed.append(self)
 
     @staticmethod
     def parse(ui, args):
@@ -236,10 +255,11 @@ class LineBreakpoint(Breakpoint):
 
 
 class TemporaryLineBreakpoint(LineBreakpoint):
+
     def on_add(self):
         pass
 
-    def on_remove(self):
+    def on_remove(self, removed=None):
         pass
 
     def get_cmd(self):
@@ -1,5 +1,6 @@
 import errno
 import queue
+import select
 import socket
 import sys
 import threading
@@ -8,9 +9,26 @@ import time
 from . import log
 
 
+def tune_socket(sock):
+    """Set options on an accepted debugger socket.
+
+    DBGP is a synchronous protocol of short request/response messages,
+    so Nagle's algorithm is disabled to avoid delaying each command.
+    The buffer sizes are left to the kernel's autotuning.
+
+    sock -- the accepted socket
+    """
+    try:
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+    except socket.error as e:
+        log.Log("Failed to set socket options: %s" % e, log.Logger.DEBUG)
+
+
 class ConnectionHandler:
     """Handles read and write operations to a given socket."""
 
+    RECV_BUFFER_SIZE = 131072
+
     def __init__(self, socket, address):
         """Accept the socket used for reading and writing.
 
@@ -18,6 +36,7 @@ class ConnectionHandler:
         """
         self.sock = socket
         self.address = address
+        self.__rfile = None
 
     def __del__(self):
         """Make sure the connection is closed."""
@@ -29,66 +48,62 @@ class ConnectionHandler:
     def close(self):
         """Close the connection."""
         log.Log("Closing the socket", log.Logger.DEBUG)
+        if self.__rfile is not None:
+            self.__rfile.close()
+            self.__rfile = None
         self.sock.close()
 
-    def __recv_length(self):
-        """Get the length of the proceeding message."""
-        length = []
-        while 1:
-            c = self.sock.recv(1)
-            if c == b'':
-                self.close()
-                raise EOFError('Socket Closed')
-            if c == b'\x00':
-                return int(b''.join(length))
-            if c.isdigit():
-                length.append(c)
-
-    def __recv_null(self):
-        """Receive a null byte."""
+    def __reader(self):
+        """Get a buffered binary file object for reading the socket."""
+        if self.__rfile is None:
+            self.__rfile = self.sock.makefile(
+                'rb', buffering=self.RECV_BUFFER_SIZE)
+        return self.__rfile
+
+    def __eof(self):
+        self.close()
+        raise EOFError('Socket Closed')
+
+    def __read_until_null(self):
+        """Read up to the next null byte, returning the bytes before it."""
+        rfile = self.__reader()
+        parts = []
         while 1:
-            c = self.sock.recv(1)
-            if c == b'':
-                self.close()
-                raise EOFError('Socket Closed')
-            if c == b'\x00':
-                return
-
-    def __recv_body(self, to_recv):
-        body = []
-        while to_recv > 0:
-            buf = self.sock.recv(to_recv)
-            if buf == b'':
-                self.close()
-                raise EOFError('Socket Closed')
-            to_recv -= len(buf)
-            body.append(buf.decode("utf-8"))
-        return ''.join(body)
+            buffered = rfile.peek()
+            if not buffered:
+                self.__eof()
+            nul = buffered.find(b'\x00')
+            if nul != -1:
+                parts.append(rfile.read(nul + 1)[:-1])
+                return b''.join(parts)
+            parts.append(rfile.read(len(buffered)))
 
     def recv_msg(self):
         """Receive a message from the debugger.
 
         Returns a string, which is expected to be XML.
         """
-        length = self.__recv_length()
-        body = self.__recv_body(length)
-        self.__recv_null()
-        return body
+        length = int(self.__read_until_null())
+        body = self.__reader().read(length)
+        if len(body) < length:
+            self.__eof()
+        self.__read_until_null()
+        return body.decode("utf-8")
 
     def send_msg(self, cmd):
         """Send a message to the debugger.
 
         cmd -- command to send
         """
-        #self.sock.send(cmd + '\0')
-        MSGLEN = len(cmd)
-        totalsent = 0
-        while totalsent < MSGLEN:
-            sent = self.sock.send(bytes(cmd[totalsent:].encode()))
-            if sent == 0:
-                raise RuntimeError("socket connection broken")
-            totalsent = totalsent + sent
-        sent = self.sock.send(b'\x00')
+        self.sock.sendall(cmd.encode('utf-8') + b'\x00')
+
+    def send_msgs(self, cmds):
+        """Send several messages to the debugger in a single write.
+
+        cmds -- list of commands to send
+        """
+        self.sock.sendall(b''.join(cmd.encode('utf-8') + b'\x00'
+                                   for cmd in cmds))
 
 
 class SocketCreator:
@@ -116,7 +131,9 @@ class SocketCreator:
         serv = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
         try:
             serv.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
-            serv.setblocking(1)
+            # Wait in accept() for short periods, so user interrupts can
+            # be checked between them
+            serv.settimeout(0.1)
             serv.bind((host, port))
             serv.listen(5)
             self.__sock = self.listen(serv, timeout)
@@ -141,7 +158,9 @@ class SocketCreator:
                 """Check for user interrupts"""
                 if self.input_stream is not None:
                     self.input_stream.probe()
-                return serv.accept()
+                client, address = serv.accept()
+                tune_socket(client)
+                return client, address
             except socket.error:
                 pass
 
@@ -157,11 +176,17 @@ class SocketCreator:
 
 class BackgroundSocketCreator(threading.Thread):
 
-    def __init__(self, host, port, message_q, output_q):
+    def __init__(self, host, port, message_q, output_q, wakeup):
+        """Create the listener thread.
+
+        wakeup -- socket that becomes readable when a message has been
+                  put on message_q
+        """
         self.__message_q = message_q
         self.__output_q = output_q
         self.__host = host
         self.__port = port
+        self.__wakeup = wakeup
         threading.Thread.__init__(self)
 
     @staticmethod
@@ -176,13 +201,20 @@ class BackgroundSocketCreator(threading.Thread):
             s.setblocking(1)
             s.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
             s.bind((self.__host, self.__port))
-            s.settimeout(5) # timeout after 5 seconds so we can check messages
             s.listen(5)
             while 1:
                 try:
+                    # Sleep until either a client connects or we are woken
+                    # up to check messages
+                    readable = select.select([s, self.__wakeup], [], [])[0]
+                    if self.__wakeup in readable:
+                        self.__wakeup.recv(1)
                     self.__peek_for_exit()
+                    if s not in readable:
+                        continue
                     client, address = s.accept()
                     self.log("Found client, %s" % str(address))
+                    tune_socket(client)
                     self.__output_q.put((client, address))
                     break
                 except socket.error:
@@ -222,14 +254,18 @@ class SocketServer:
         self.__message_q = queue.Queue(0)
         self.__socket_q = queue.Queue(1)
         self.__thread = None
+        self.__wakeup = None
 
     def __del__(self):
         self.stop()
 
     def start(self, host, port):
         if not self.is_alive():
+            self.__close_wakeup()
+            self.__wakeup = socket.socketpair()
             self.__thread = BackgroundSocketCreator(
-                host, port, self.__message_q, self.__socket_q)
+                host, port, self.__message_q, self.__socket_q,
+                self.__wakeup[1])
             self.__thread.start()
 
     def is_alive(self):
@@ -244,6 +280,14 @@ class SocketServer:
     def stop(self):
         if self.is_alive():
             self.__message_q.put_nowait("exit")
+            self.__wakeup[0].send(b'\x00')
             self.__thread.join(3000)
+        self.__close_wakeup()
         if self.has_socket():
             self.socket()[0].close()
+
+    def __close_wakeup(self):
+        if self.__wakeup is not None:
+            for s in self.__wakeup:
+                s.close()
+            self.__wakeup = None
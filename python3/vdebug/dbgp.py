@@ -18,28 +18,28 @@ class Response:
         self.cmd_args = cmd_args
         self.xml = None
         self.api = api
-        if "<error" in self.response:
-            self.__parse_error()
 
-    def __parse_error(self):
-        """Parse an error message which has been returned
-        in the response, then raise it as a DBGPError."""
+    def raise_for_error(self):
+        """Check the parsed response for an error element, and raise
+        it as a DBGPError if one has been returned.
+
+        The XML is parsed once and kept for later calls to as_xml().
+        """
         xml = self.as_xml()
         err_el = xml.find('%serror' % self.ns)
         if err_el is None:
-            raise DBGPError("Could not parse error from return XML", 1)
-        else:
-            code = err_el.get("code")
-            if code is None:
-                raise ResponseError("Missing error code in response",
-                                    self.response)
-            elif int(code) == 4:
-                raise CmdNotImplementedError('Command not implemented')
-            msg_el = err_el.find('%smessage' % self.ns)
-            if msg_el is None:
-                raise ResponseError("Missing error message in response",
-                                    self.response)
-            raise DBGPError(msg_el.text, code)
+            return
+        code = err_el.get("code")
+        if code is None:
+            raise ResponseError("Missing error code in response",
+                                self.response)
+        elif int(code) == 4:
+            raise CmdNotImplementedError('Command not implemented')
+        msg_el = err_el.find('%smessage' % self.ns)
+        if msg_el is None:
+            raise ResponseError("Missing error message in response",
+                                self.response)
+        raise DBGPError(msg_el.text, code)
 
     def get_cmd(self):
         """Get the command that created this response."""
@@ -97,10 +97,33 @@ class TraceResponse(Response):
 
 
 class StatusResponse(Response):
-    """Response object returned by the status command."""
+    """Response object returned by the status command.
+
+    Status responses have a fixed, shallow schema: the status is an
+    attribute of the root element, ahead of any child content. This
+    lets the status be read from the raw message without building the
+    XML tree, which as_xml() still provides for other consumers.
+    """
+
+    def __init__(self, response, cmd, cmd_args, api):
+        Response.__init__(self, response, cmd, cmd_args, api)
+        self.status = None
+
+    def raise_for_error(self):
+        # Only parse if there could be an error element.
+        if "<error" in self.response:
+            Response.raise_for_error(self)
 
     def __str__(self):
-        return self.as_xml().get('status')
+        if self.status is None:
+            if self.xml is None:
+                status = self.response.partition(
+                    'status="')[2].partition('"')[0]
+                if status:
+                    self.status = status
+                    return status
+            self.status = self.as_xml().get('status')
+        return self.status
 
 
 class StackGetResponse(Response):
@@ -135,9 +158,9 @@ class ContextGetResponse(Response):
 class EvalResponse(ContextGetResponse):
     """Response object returned by the eval command."""
 
-    def __init__(self, response, cmd, cmd_args, api):
+    def raise_for_error(self):
         try:
-            ContextGetResponse.__init__(self, response, cmd, cmd_args, api)
+            ContextGetResponse.raise_for_error(self)
         except DBGPError as e:
             if int(e.args[1]) == 206:
                 raise EvalError()
@@ -173,10 +196,15 @@ class BreakpointSetResponse(Response):
 class FeatureGetResponse(Response):
     """Response object specifically for the feature_get command."""
 
+    def __init__(self, response, cmd, cmd_args, api):
+        Response.__init__(self, response, cmd, cmd_args, api)
+        self.supported = None
+
     def is_supported(self):
         """Whether the feature is supported or not."""
-        xml = self.as_xml()
-        return int(xml.get('supported'))
+        if self.supported is None:
+            self.supported = int(self.as_xml().get('supported'))
+        return self.supported
 
     def __str__(self):
         if self.is_supported():
@@ -243,16 +271,91 @@ class Api:
                 for certain commands (default '')
         """
         args = args.strip()
-        send = cmd.strip()
-        self.transID += 1
-        send += ' -i ' + str(self.transID)
-        if args:
-            send += ' ' + args
-        log.Log("Command: " + send, log.Logger.DEBUG)
+        send = self.__build_cmd(cmd, args)
+        debug = log.Log.is_enabled(log.Logger.DEBUG)
+        if debug:
+            log.Log("Command: " + send, log.Logger.DEBUG)
         self.conn.send_msg(send)
+        log.Log.flush()
         msg = self.conn.recv_msg()
-        log.Log("Response: " + msg, log.Logger.DEBUG)
-        return res_cls(msg, cmd, args, self)
+        if debug:
+            log.Log("Response: " + msg, log.Logger.DEBUG)
+        res = res_cls(msg, cmd, args, self)
+        res.raise_for_error()
+        return res
+
+    def send_batch(self, cmds):
+        """Send several commands to the debugger in a single write.
+
+        Each command gets its own transaction ID, and the responses are
+        matched back to their commands by that ID. Packets that are not
+        responses (e.g. notify or stream) are skipped. Unlike send_cmd(),
+        debugger errors are not raised here: call raise_for_error() on
+        each response to check it. A reply that is not valid XML, or a
+        response with a missing or unknown transaction ID, raises a
+        ResponseError, but only once all the replies have been read, so
+        the connection stays in step.
+
+        Returns a list of Response objects, in the same order as cmds.
+
+        cmds -- list of (cmd, args, res_cls) tuples
+        """
+        debug = log.Log.is_enabled(log.Logger.DEBUG)
+        pending = {}
+        sends = []
+        for cmd, args, res_cls in cmds:
+            args = args.strip()
+            send = self.__build_cmd(cmd, args)
+            if debug:
+                log.Log("Command: " + send, log.Logger.DEBUG)
+            pending[str(self.transID)] = (len(sends), cmd, args, res_cls)
+            sends.append(send)
+        if not sends:
+            return []
+
+        self.conn.send_msgs(sends)
+        log.Log.flush()
+        responses = [None] * len(sends)
+        error = None
+        received = 0
+        while received < len(sends):
+            msg = self.conn.recv_msg()
+            if debug:
+                log.Log("Response: " + msg, log.Logger.DEBUG)
+            packet = Response(msg, None, None, self)
+            try:
+                xml = packet.as_xml()
+            except (ET.ParseError, DBGPError):
+                received += 1
+                error = error or ResponseError(
+                    "Invalid XML in response", msg)
+                continue
+            if xml.tag != packet.ns + 'response':
+                continue
+            received += 1
+            trans_id = xml.get('transaction_id')
+            if trans_id is None:
+                error = error or ResponseError(
+                    "Missing transaction ID in response", msg)
+            elif trans_id not in pending:
+                error = error or ResponseError(
+                    "Unexpected transaction ID in response", msg)
+            else:
+                index, cmd, args, res_cls = pending.pop(trans_id)
+                res = res_cls(msg, cmd, args, self)
+                # Hand over the tree that has already been parsed
+                res.xml, res.ns = xml, packet.ns
+                responses[index] = res
+        if error is not None:
+            raise error
+        return responses
+
+    def __build_cmd(self, cmd, args):
+        """Build a command string with the next transaction ID."""
+        self.transID += 1
+        if args:
+            return '%s -i %i %s' % (cmd.strip(), self.transID, args)
+        return '%s -i %i' % (cmd.strip(), self.transID)
 
     def status(self):
         """Get the debugger status.
@@ -285,6 +388,20 @@ class Api:
         """
         return self.send_cmd('feature_set', '-n {} -v {}'.format(name, value))
 
+    def feature_set_many(self, features):
+        """Set several debugger features in a single round trip.
+
+        Errors are not raised: call raise_for_error() on each response.
+
+        Returns a list of Response objects, in the same order as
+        features.
+
+        features -- list of (name, value) pairs
+        """
+        return self.send_batch([
+            ('feature_set', '-n {} -v {}'.format(name, value), Response)
+            for name, value in features])
+
     def run(self):
         """Tell the debugger to start or resume
         execution."""
@@ -375,6 +492,17 @@ class Api:
         Breakpoint class for more detail."""
         return self.send_cmd('breakpoint_set', cmd_args, BreakpointSetResponse)
 
+    def breakpoint_set_many(self, cmd_args_list):
+        """Set several breakpoints in a single round trip.
+
+        Errors are not raised: call raise_for_error() on each response.
+
+        Returns a list of BreakpointSetResponse objects, in the same
+        order as cmd_args_list."""
+        return self.send_batch([
+            ('breakpoint_set', cmd_args, BreakpointSetResponse)
+            for cmd_args in cmd_args_list])
+
     def breakpoint_list(self):
         return self.send_cmd('breakpoint_list')
 
@@ -295,7 +295,7 @@ class RefreshEvent(Event):
             stack_res = self.__update_stack()
             stack = stack_res.get_stack()
 
-            self.session.cur_file = util.RemoteFilePath(
+            self.session.cur_file = util.RemoteFilePath.cached(
                 stack[0].get('filename'))
             self.session.cur_lineno = stack[0].get('lineno')
 
@@ -733,7 +733,7 @@ class ChangeStackEvent(Event):
         log.Log("Getting %s variables" % name)
         context_res = self.api.context_get(context_id, args)
         rend = vimui.ContextGetResponseRenderer(
-            context_res, "%s at %s:%s" % (name, str(util.FilePath(stack.get('filename')).as_local()),
+            context_res, "%s at %s:%s" % (name, str(util.FilePath.cached(stack.get('filename')).as_local()),
                                           stack.get('lineno')),
             self.session.context_names, context_id)
         self.ui.selected_stack = args
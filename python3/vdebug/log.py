@@ -14,14 +14,19 @@ class Logger:
 
     (ERROR, INFO, DEBUG) = (0, 1, 2)
     TYPES = ("ERROR", "Info", "Debug")
+    FORMATS = tuple("- [%s] {%%s} %%s" % t for t in TYPES)
     debug_level = ERROR
 
     def __init__(self, debug_level):
         self.debug_level = int(debug_level)
 
+    def is_enabled(self, level):
+        """ Whether messages of the given level will be logged """
+        return level <= self.debug_level
+
     def log(self, string, level):
         """ Log a message """
-        if level > self.debug_level:
+        if not self.is_enabled(level):
             return
         self._actual_log(string, level)
 
@@ -33,6 +38,10 @@ class Logger:
         """ Action to perform when closing the logger """
         pass
 
+    def flush(self):
+        """ Write out any buffered messages """
+        pass
+
     @staticmethod
     def time():
         """ Get a nicely formatted time string """
@@ -40,8 +49,7 @@ class Logger:
 
     def format(self, string, level):
         """ Format the error message in a standard way """
-        display_level = self.TYPES[level]
-        return "- [%s] {%s} %s" % (display_level, self.time(), string)
+        return self.FORMATS[level] % (self.time(), string)
 
 
 class WindowLogger(Logger):
@@ -74,9 +82,13 @@ class FileLogger(Logger):
     only created if a message is written.
     """
 
-    def __init__(self, debug_level, filename):
+    def __init__(self, debug_level, filename, autoflush=True):
+        """ Without autoflush, messages are left to the file's buffer
+        and only errors are flushed straight away.
+        """
         self.filename = os.path.expanduser(filename)
         self.f = None
+        self._autoflush = autoflush
         super(FileLogger, self).__init__(debug_level)
 
     def __open(self):
@@ -93,11 +105,16 @@ class FileLogger(Logger):
         if self.f is not None:
             self.f.close()
 
+    def flush(self):
+        if self.f is not None:
+            self.f.flush()
+
     def _actual_log(self, string, level):
         if self.f is None:
             self.__open()
         self.f.write(self.format(string, level)+"\n")
-        self.f.flush()
+        if self._autoflush or level == self.ERROR:
+            self.f.flush()
 
 
 class Log:
@@ -114,6 +131,26 @@ class Log:
         for logger in cls.loggers.values():
             logger.log(string, level)
 
+    @classmethod
+    def is_enabled(cls, level):
+        """ Whether any logger will log messages of the given level.
+
+        Use this to avoid building expensive log messages that would
+        be discarded anyway.
+        """
+        for logger in cls.loggers.values():
+            if logger.is_enabled(level):
+                return True
+        return False
+
+    @classmethod
+    def flush(cls):
+        """ Write out messages buffered by any logger, e.g. before
+        blocking on the debugger.
+        """
+        for logger in cls.loggers.values():
+            logger.flush()
+
     @classmethod
     def set_logger(cls, logger):
         k = logger.__class__.__name__
@@ -1,9 +1,22 @@
 
+EMPTY_PATH_MAPS = ()
+
+
 class Options:
     instance = None
 
     def __init__(self, options):
         self.options = options
+        self.sorted_path_maps = self.__sort_path_maps()
+
+    def __sort_path_maps(self):
+        """Sort the path maps by remote path, longest first, so the most
+        specific mapping is tried first."""
+        path_maps = self.options.get('path_maps')
+        if not path_maps:
+            return EMPTY_PATH_MAPS
+        return tuple(sorted(dict(path_maps).items(),
+                            key=lambda l: len(l[0]), reverse=True))
 
     @classmethod
     def set(cls, options):
@@ -45,6 +58,14 @@ class Options:
     def overwrite(cls, name, value):
         inst = cls.inst()
         inst.options[name] = value
+        if name == 'path_maps':
+            inst.sorted_path_maps = inst.__sort_path_maps()
+
+    @classmethod
+    def get_sorted_path_maps(cls):
+        """Get the (remote, local) path map pairs, longest remote path
+        first."""
+        return cls.inst().sorted_path_maps
 
     @classmethod
     def isset(cls, name):
@@ -94,6 +94,8 @@ class SessionHandler:
     def status(self):
         if self.is_connected():
             return "running"
+        if self.listener is None:
+            return "inactive"
         return self.listener.status()
 
     def status_for_statusline(self):
@@ -184,6 +186,8 @@ class Session:
         except socket.error:
             self.__api = None
             self.__ui.say("Connection has been closed")
+        finally:
+            log.Log.flush()
 
     def start(self, connection):
         util.Environment.reload()
@@ -232,13 +236,15 @@ class Session:
     def __set_features(self):
         """Evaluate vim dictionary of features and pass to debugger.
 
-        Errors are caught if the debugger doesn't like the feature name or
-        value. This doesn't break the loop, so multiple features can be set
-        even in the case of an error."""
-        features = vim.eval('g:vdebug_features')
-        for name, value in features.items():
+        All features are sent in a single batch. Errors are caught if the
+        debugger doesn't like the feature name or value. This doesn't break
+        the loop, so multiple features can be set even in the case of an
+        error."""
+        features = list(vim.eval('g:vdebug_features').items())
+        responses = self.__api.feature_set_many(features)
+        for (name, value), res in zip(features, responses):
             try:
-                self.__api.feature_set(name, value)
+                res.raise_for_error()
             except dbgp.DBGPError as e:
                 error_str = "Failed to set feature %s: %s" % (name, e.args[0])
                 self.__ui.error(error_str)
@@ -14,6 +14,24 @@ class WindowError(Exception):
     pass
 
 
+def batch_command(cmds):
+    """Join Ex commands so they can be run with a single vim.command().
+
+    Each command is wrapped in :execute, as some commands (e.g. :sign)
+    treat a bar as part of their argument.
+    """
+    return ' | '.join("execute '%s'" % str(cmd).replace("'", "''")
+                      for cmd in cmds)
+
+
+def _as_lines(msg):
+    """Split a message into buffer lines, unless it already is a list of
+    lines."""
+    if isinstance(msg, list):
+        return msg
+    return str(msg).split('\n')
+
+
 class WindowManager:
 
     def __init__(self):
@@ -67,8 +85,10 @@ class WindowManager:
         self.window(name).toggle(self._command(name))
 
     def close(self):
-        for win in self._windows.values():
-            win.destroy()
+        cmds = [win.destroy_cmd() for win in self._windows.values()]
+        cmds = [cmd for cmd in cmds if cmd]
+        if cmds:
+            vim.command(batch_command(cmds))
 
     def watch(self):
         return self.window("DebuggerWatch")
@@ -294,7 +314,22 @@ class Ui(interface.Ui):
         vim.command('sign unplace %i' % id)
         self.windows.breakpoints().remove_breakpoint(id)
 
+    def remove_breakpoints(self, breakpoints):
+        """Remove the signs for several breakpoints with a single Vim
+        command."""
+        if not breakpoints:
+            return
+        vim.command(batch_command('sign unplace %i' % bp.id
+                                  for bp in breakpoints))
+        for bp in breakpoints:
+            self.windows.breakpoints().remove_breakpoint(bp.id)
+
     def get_breakpoint_sign_positions(self):
+        if int(vim.eval("exists('*sign_getplaced')")):
+            return {sign['id']: sign['lnum']
+                    for buf in vim.eval('sign_getplaced()')
+                    for sign in buf['signs']
+                    if sign['name'].startswith('breakpt')}
         sign_lines = self.command('sign place').split("\n")
         positions = {}
         for line in sign_lines:
@@ -331,13 +366,15 @@ class Ui(interface.Ui):
         self.is_open = False
 
         log.Log.remove_logger('WindowLogger')
+        cmds = []
         if self.tabnr:
-            vim.command('silent! %stabc!' % self.tabnr)
+            cmds.append('silent! %stabc!' % self.tabnr)
         if self.current_tab:
-            vim.command('tabn %s' % self.current_tab)
-
+            cmds.append('tabn %s' % self.current_tab)
         if self.empty_buf_num:
-            vim.command('bw%s' % self.empty_buf_num)
+            cmds.append('bw%s' % self.empty_buf_num)
+        if cmds:
+            vim.command(batch_command(cmds))
 
         self.windows.close()
 
@@ -387,9 +424,10 @@ class SourceWindow(interface.Window):
 
     def place_pointer(self, line):
         log.Log("Placing pointer sign on line "+str(line), log.Logger.INFO)
-        self.remove_pointer()
-        vim.command('sign place %s name=current priority=99 line=%s file=%s'
-                    % (self.pointer_sign_id, line, self.file))
+        vim.command(batch_command([
+            'sign unplace %s' % self.pointer_sign_id,
+            'sign place %s name=current priority=99 line=%s file=%s'
+            % (self.pointer_sign_id, line, self.file)]))
 
     def remove_pointer(self):
         vim.command('sign unplace %s' % self.pointer_sign_id)
@@ -410,9 +448,9 @@ class VimBuffer:
         if return_focus:
             prev_win = vim.current.window.number
         if self.is_empty():
-            self._buffer[:] = str(msg).split('\n')
+            self._buffer[:] = _as_lines(msg)
         else:
-            self._buffer.append(str(msg).split('\n'))
+            self._buffer.append(_as_lines(msg))
             after_callback()
             if return_focus:
                 vim.command('%swincmd W' % prev_win)
@@ -422,22 +460,12 @@ class VimBuffer:
         if not msg and not allowEmpty:
             return
         if self.is_empty():
-            self._buffer[:] = str(msg).split('\n')
+            self._buffer[:] = _as_lines(msg)
         else:
             if lineno is None:
                 lineno, col = vim.current.window.cursor
-            remaining_buffer = str(msg).split('\n')
-            if overwrite:
-                lfrom = lineno + 1
-            else:
-                lfrom = lineno
-            remaining_buffer.extend(self._buffer[lfrom:])
-            del self._buffer[lineno:]
-            if self.is_empty():
-                self._buffer[:] = remaining_buffer
-            else:
-                for line in remaining_buffer:
-                    self._buffer.append(line)
+            end = lineno + 1 if overwrite else lineno
+            self._buffer[lineno:end] = _as_lines(msg)
             after_callback()
 
     def delete(self, start_line, end_line=None):
@@ -460,6 +488,9 @@ class VimBuffer:
     def is_empty(self):
         return bool(len(self._buffer) == 1 and not self._buffer[0])
 
+    def is_current(self):
+        return vim.current.buffer.number == self._buffer.number
+
 
 class HiddenBuffer:
 
@@ -474,25 +505,20 @@ class HiddenBuffer:
     def write(self, msg, return_focus, after):
         if self.is_empty():
             # If empty
-            self._buffer[:] = str(msg).split('\n')
+            self._buffer[:] = _as_lines(msg)
         else:
             # Otherwise add to the end
-            self._buffer.extend(str(msg).split('\n'))
+            self._buffer.extend(_as_lines(msg))
 
     def insert(self, msg, lineno, overwrite, allowEmpty, after_callback):
         """ insert into current position in buffer"""
         if not msg and not allowEmpty:
             return
         if self.is_empty():
-            self._buffer[:] = str(msg).split('\n')
+            self._buffer[:] = _as_lines(msg)
         else:
-            if overwrite:
-                from_line = lineno
-                to_line = lineno + 1
-            else:
-                from_line = lineno
-                to_line = lineno
-            self._buffer[from_line:to_line] = str(msg).split('\n')
+            end = lineno + 1 if overwrite else lineno
+            self._buffer[lineno:end] = _as_lines(msg)
         log.Log("Hidden buffer after insert: %s" % (self._buffer),
                 log.Logger.DEBUG)
 
@@ -513,11 +539,16 @@ class HiddenBuffer:
     def is_empty(self):
         return not self._buffer
 
+    @staticmethod
+    def is_current():
+        return False
+
 
 class Window(interface.Window):
 
     name = "WINDOW"
     creation_count = 0
+    has_win_execute = None
 
     def __init__(self):
         self._buffer = HiddenBuffer()
@@ -537,7 +568,7 @@ class Window(interface.Window):
 
     def set_height(self, height):
         height = int(height)
-        minheight = int(vim.eval("&winminheight"))
+        minheight = vim.options['winminheight']
         if height < minheight:
             height = minheight
         if height <= 0:
@@ -590,21 +621,46 @@ class Window(interface.Window):
 
     def destroy(self, wipeout=True):
         """ destroy window """
+        cmd = self.destroy_cmd(wipeout)
+        if cmd:
+            vim.command(cmd)
+
+    def destroy_cmd(self, wipeout=True):
+        """Mark the window as destroyed and return the Vim command that
+        wipes out its buffer, for the caller to run."""
         if self._buffer is None:
-            return
+            return None
         self.is_open = False
         self._buffer = HiddenBuffer(self._buffer.contents())
-        if wipeout and int(vim.eval('buffer_exists("%s")' % self.name)) == 1:
-            vim.command('bwipeout %s' % self.name)
         self.on_destroy()
+        if not wipeout:
+            return None
+        return 'if bufexists(\'%s\') | bwipeout %s | endif' % (
+            self.name, self.name)
 
     def clean(self):
         """ clean all data in buffer """
         self._buffer.clean()
 
     def command(self, cmd):
-        """ go to my window & execute command """
+        """ execute command in my window """
+        if self._buffer.is_current():
+            vim.command(str(cmd))
+            return
+        if Window.has_win_execute is None:
+            Window.has_win_execute = \
+                int(vim.eval("exists('*win_execute')")) == 1
+        if Window.has_win_execute:
+            # Runs in the window without switching to it, and does
+            # nothing if the buffer isn't shown in any window
+            vim.command("call win_execute(bufwinid('%s'), '%s')"
+                        % (self.name, str(cmd).replace("'", "''")))
+            return
         winnr = self.getwinnr()
+        if winnr == -1:
+            log.Log("Window %s is not visible, skipping command: %s"
+                    % (self.name, cmd), log.Logger.DEBUG)
+            return
         if winnr != vim.current.window.number:
             vim.command(str(winnr) + 'wincmd w')
         vim.command(str(cmd))
@@ -756,11 +812,14 @@ class StatusWindow(Window):
             if opts.Options.get("simplified_status", int):
                 self.set_status("listening")
             else:
-                output = "Status: starting\nListening on port\nNot connected\n\n"
-                output += "Press %s to start debugging, " % (keys.run_key())
-                output += "%s to stop/close. " % (keys.close_key())
-                output += "Type :help Vdebug for more information."
-                self.write(output)
+                self.write([
+                    "Status: starting",
+                    "Listening on port",
+                    "Not connected",
+                    "",
+                    "Press %s to start debugging, %s to stop/close. "
+                    "Type :help Vdebug for more information."
+                    % (keys.run_key(), keys.close_key())])
                 self.set_height(6)
 
     def set_status(self, status):
@@ -781,25 +840,25 @@ class StatusWindow(Window):
             output += "[%s Stop] " % (keys.close_key())
             output += "[:help Vdebug]"
 
-            self.insert(output, 0, True)
+            self.insert([output], 0, True)
         else:
-            self.insert("Status: %s" % str(status), 0, True)
+            self.insert(["Status: %s" % str(status)], 0, True)
 
     def mark_as_stopped(self):
         self.set_status("stopped")
         if opts.Options.get("simplified_status", int) != 1:
-            self.insert("Not connected", 2, True)
+            self.insert(["Not connected"], 2, True)
 
     def set_conn_details(self, addr, port):
         if opts.Options.get("simplified_status", int) != 1:
-            self.insert("Connected to %s:%s" % (addr, port), 2, True)
+            self.insert(["Connected to %s:%s" % (addr, port)], 2, True)
 
     def set_listener_details(self, addr, port, idekey):
         if opts.Options.get("simplified_status", int) != 1:
             details = "Listening on %s:%s" % (addr, port)
             if idekey:
                 details += " (IDE key: %s)" % idekey
-            self.insert(details, 1, True)
+            self.insert([details], 1, True)
 
 
 class TraceWindow(WatchWindow):
@@ -858,18 +917,18 @@ class StackGetResponseRenderer(ResponseRenderer):
 
     def render(self):
         stack = self.response.get_stack()
-        string = ""
+        lines = []
         for s in stack:
             if s.get('where'):
                 where = s.get('where')
             else:
                 where = 'main'
-            file = util.FilePath(s.get('filename'))
+            file = util.FilePath.cached(s.get('filename'))
             line = "[%(num)s] %(where)s @ %(file)s:%(line)s" % {
                 'num': s.get('level'), 'where': where,
                 'file': str(file.as_local()), 'line': s.get('lineno')}
-            string += line + "\n"
-        return string
+            lines.append(line + "\n")
+        return "".join(lines)
 
 
 class ContextGetResponseRenderer(ResponseRenderer):
@@ -881,15 +940,24 @@ class ContextGetResponseRenderer(ResponseRenderer):
         self.current_context = current_context
 
     def render(self, indent=0):
-        res = self.__create_tabs()
+        parts = [self.__create_tabs()]
 
         if self.title:
-            res += "- %s\n\n" % self.title
+            parts.append("- %s\n\n" % self.title)
 
         properties = self.response.get_context()
         num_props = len(properties)
-        log.Log("Writing %i properties to the window" % num_props,
-                log.Logger.INFO)
+        if log.Log.is_enabled(log.Logger.INFO):
+            log.Log("Writing %i properties to the window" % num_props,
+                    log.Logger.INFO)
+
+        # Look up options once, rather than for every property
+        self.__expanded = opts.Options.get('watch_window_style') == 'expanded'
+        self.__markers = (opts.Options.get('marker_default'),
+                          opts.Options.get('marker_closed_tree'),
+                          opts.Options.get('marker_open_tree'))
+        render_property = self.__render_property
+        extend = parts.extend
         for idx, prop in enumerate(properties):
             final = False
             try:
@@ -897,9 +965,11 @@ class ContextGetResponseRenderer(ResponseRenderer):
             except IndexError:
                 final = True
                 next_prop = None
-            res += self.__render_property(prop, next_prop, final, indent)
+            extend(render_property(prop, next_prop, final, indent))
 
-        log.Log("Writing to window:\n"+res, log.Logger.DEBUG)
+        res = "".join(parts)
+        if log.Log.is_enabled(log.Logger.DEBUG):
+            log.Log("Writing to window:\n"+res, log.Logger.DEBUG)
 
         return res
 
@@ -915,17 +985,14 @@ class ContextGetResponseRenderer(ResponseRenderer):
         return ""
 
     def __render_property(self, p, next_p, last=False, indent=0):
-        indent_str = "".rjust((p.depth * 2)+indent)
-        line = "%(indent)s %(marker)s %(name)s = (%(type)s)%(value)s" % {
-            'indent': indent_str,
-            'marker': self.__get_marker(p),
-            'name': p.display_name,
-            'type': p.type_and_size(),
-            'value': " " + p.value
-        }
-        line = line.rstrip() + "\n"
-
-        if opts.Options.get('watch_window_style') == 'expanded':
+        """Render a property as a list of string fragments, to be joined
+        by the caller."""
+        line = "%s %s %s = (%s) %s" % (
+            " " * ((p.depth * 2)+indent), self.__get_marker(p),
+            p.display_name, p.type_and_size(), p.value)
+        parts = [line.rstrip(), "\n"]
+
+        if self.__expanded:
             depth = p.depth
             if next_p and not last:
                 next_depth = next_p.depth
@@ -934,27 +1001,26 @@ class ContextGetResponseRenderer(ResponseRenderer):
                     num_spaces = depth * 2
                 elif depth > next_depth:
                     if not p.is_last_child:
-                        line += "".rjust(depth * 2 + indent) + " |\n"
-                        line += "".rjust(depth * 2 + indent) + " ...\n"
+                        parts.append(" " * (depth * 2 + indent) + " |\n")
+                        parts.append(" " * (depth * 2 + indent) + " ...\n")
                     next_sep = "/"
                     num_spaces = (depth * 2) - 1
                 else:
                     next_sep = "\\"
                     num_spaces = (depth * 2) + 1
 
-                line += "".rjust(num_spaces+indent) + " " + next_sep + "\n"
+                parts.append(" " * (num_spaces+indent) + " " + next_sep + "\n")
             elif depth > 0:
                 if not p.is_last_child:
-                    line += "".rjust(depth * 2 + indent) + " |\n"
-                    line += "".rjust(depth * 2 + indent) + " ...\n"
-                line += "".rjust((depth * 2) - 1 + indent) + " /" + "\n"
-        return line
+                    parts.append(" " * (depth * 2 + indent) + " |\n")
+                    parts.append(" " * (depth * 2 + indent) + " ...\n")
+                parts.append(" " * ((depth * 2) - 1 + indent) + " /" + "\n")
+        return parts
 
     def __get_marker(self, property):
-        char = opts.Options.get('marker_default')
+        default, closed_tree, open_tree = self.__markers
         if property.has_children:
             if property.child_count() == 0:
-                char = opts.Options.get('marker_closed_tree')
-            else:
-                char = opts.Options.get('marker_open_tree')
-        return char
+                return closed_tree
+            return open_tree
+        return default
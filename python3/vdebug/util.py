@@ -1,8 +1,8 @@
+import functools
 import os
 import re
 import socket
 import sys
-import time
 import traceback
 import urllib.parse as urllib
 
@@ -13,6 +13,9 @@ from . import error
 from . import log
 from . import opts
 
+_MAP_LINE_RE = re.compile(r'^([nvxsoilc]|)(nore)?map!?.*$', re.MULTILINE)
+_WIN_DRIVE_RE = re.compile(r'^/?[a-zA-Z]:')
+
 
 class ExceptionHandler:
 
@@ -107,6 +110,10 @@ class Keymapper:
     exclude = ["run", "close", "set_breakpoint", "enable_breakpoint", "disable_breakpoint",
                "toggle_breakpoint", "eval_visual"]
 
+    # Shared by all instances, as one is created for every status update
+    _cached_keymaps = None
+    _cached_leader = None
+
     def __init__(self):
         self.is_mapped = False
         self._reload_keys()
@@ -123,7 +130,6 @@ class Keymapper:
         if self.is_mapped:
             return
         self._store_old_map()
-        self._reload_keys()
         for func in self.keymaps:
             if func not in self.exclude:
                 key = self.keymaps[func]
@@ -135,29 +141,40 @@ class Keymapper:
     def reload(self):
         log.Log("keymapper: reload", log.Logger.DEBUG)
         self.is_mapped = False
+        self._invalidate()
+        self._reload_keys()
         self.map()
 
     def _reload_keys(self):
-        log.Log("keymapper: reload_keys", log.Logger.DEBUG)
-        self.keymaps = vim.eval("g:vdebug_keymap")
-        self.leader = vim.eval("g:vdebug_leader_key")
+        if Keymapper._cached_keymaps is None \
+                or Keymapper._cached_leader is None:
+            log.Log("keymapper: reload_keys", log.Logger.DEBUG)
+            Keymapper._cached_keymaps = vim.eval("g:vdebug_keymap")
+            Keymapper._cached_leader = vim.eval("g:vdebug_leader_key")
+        self.keymaps = Keymapper._cached_keymaps
+        self.leader = Keymapper._cached_leader
+
+    @staticmethod
+    def _invalidate():
+        """Forget the cached keymap so it is read again from Vim."""
+        Keymapper._cached_keymaps = None
+        Keymapper._cached_leader = None
 
     def _store_old_map(self):
         log.Log("keymapper: store_old_map", log.Logger.DEBUG)
-        vim.command('let tempfile=tempname()')
-        tempfile = vim.eval("tempfile")
+        tempfile = vim.eval("tempname()")
         vim.command('mkexrc! %s' % (tempfile))
-        regex = re.compile(r'^([nvxsoilc]|)(nore)?map!?')
-        split_regex = re.compile(r'\s+')
         keys = {v for k, v in self.keymaps.items() if k not in self.exclude}
         special = {"<buffer>", "<silent>", "<special>", "<script>", "<expr>",
                    "<unique>"}
-        for line in open(tempfile, 'rb'):
-            line = line.decode('utf-8', errors='replace')
-            log.Log("keymapper: line '%s'" % line, log.Logger.DEBUG)
-            if not regex.match(line):
-                continue
-            parts = split_regex.split(line)[1:]
+        with open(tempfile, 'rb') as f:
+            text = f.read().decode('utf-8', errors='replace')
+        debug = log.Log.is_enabled(log.Logger.DEBUG)
+        for match in _MAP_LINE_RE.finditer(text):
+            line = match.group(0)
+            if debug:
+                log.Log("keymapper: line '%s'" % line, log.Logger.DEBUG)
+            parts = line.split()[1:]
             for p in parts:
                 if p in special:
                     continue
@@ -193,14 +210,14 @@ class FilePath:
     def __init__(self, filename):
         if not filename:
             raise error.FilePathError("Missing or invalid file name")
-        filename = urllib.unquote(filename)
+        if '%' in filename:
+            filename = urllib.unquote(filename)
         if filename.startswith('file:'):
             filename = filename[5:]
             if filename.startswith('///'):
                 filename = filename[2:]
 
-        p = re.compile('^/?[a-zA-Z]:')
-        if p.match(filename):
+        if _WIN_DRIVE_RE.match(filename):
             self.is_win = True
             if filename[0] == "/":
                 filename = filename[1:]
@@ -216,26 +233,22 @@ class FilePath:
         """
         ret = f
 
-        if opts.Options.isset('path_maps'):
-            sorted_path_maps = sorted(
-                opts.Options.get('path_maps', dict).items(),
-                key=lambda l: len(l[0]), reverse=True)
-            for remote, local in sorted_path_maps:
-                if remote in ret:
-                    log.Log("Replacing remote path (%s) with local path (%s)"
-                            % (remote, local), log.Logger.DEBUG)
-                    if not local.endswith('/') and remote.endswith('/'):
-                        local = local+'/'
-                    elif local.endswith('/') and not remote.endswith('/'):
-                        local = local[:-1]
-                    ret = ret.replace(remote, local, 1)
-
-                    # determine remote path separator and replace by local
-                    local_sep = self._findSeparator(local)
-                    remote_sep = self._findSeparator(remote)
-                    if local_sep and remote_sep and remote_sep != local_sep:
-                        ret = ret.replace(remote_sep, local_sep)
-                    break
+        for remote, local in opts.Options.get_sorted_path_maps():
+            if remote in ret:
+                log.Log("Replacing remote path (%s) with local path (%s)"
+                        % (remote, local), log.Logger.DEBUG)
+                if not local.endswith('/') and remote.endswith('/'):
+                    local = local+'/'
+                elif local.endswith('/') and not remote.endswith('/'):
+                    local = local[:-1]
+                ret = ret.replace(remote, local, 1)
+
+                # determine remote path separator and replace by local
+                local_sep = self._findSeparator(local)
+                remote_sep = self._findSeparator(remote)
+                if local_sep and remote_sep and remote_sep != local_sep:
+                    ret = ret.replace(remote_sep, local_sep)
+                break
 
         return ret
 
@@ -247,24 +260,20 @@ class FilePath:
         """
         ret = f
 
-        if opts.Options.isset('path_maps'):
-            sorted_path_maps = sorted(
-                opts.Options.get('path_maps', dict).items(),
-                key=lambda l: len(l[0]), reverse=True)
-            for remote, local in sorted_path_maps:
-                if local in ret:
-                    log.Log("Replacing local path (%s) with remote path (%s)"
-                            % (local, remote), log.Logger.DEBUG)
-                    if not remote.endswith('/') and local.endswith('/'):
-                        remote = remote+'/'
-                    elif remote.endswith('/') and not local.endswith('/'):
-                        remote = remote[:-1]
-                    ret = ret.replace(local, remote, 1)
-                    """
-                    replace remaining local separators with URL '/' separators
-                    """
-                    ret = ret.replace('\\', '/')
-                    break
+        for remote, local in opts.Options.get_sorted_path_maps():
+            if local in ret:
+                log.Log("Replacing local path (%s) with remote path (%s)"
+                        % (local, remote), log.Logger.DEBUG)
+                if not remote.endswith('/') and local.endswith('/'):
+                    remote = remote+'/'
+                elif remote.endswith('/') and not local.endswith('/'):
+                    remote = remote[:-1]
+                ret = ret.replace(local, remote, 1)
+                """
+                replace remaining local separators with URL '/' separators
+                """
+                ret = ret.replace('\\', '/')
+                break
 
         if ret.startswith('phar://'):
             return ret
@@ -272,6 +281,20 @@ class FilePath:
             return "file://"+ret
         return "file:///"+ret
 
+    @classmethod
+    def cached(cls, filename):
+        """Get a shared instance for the file name, which is only built the
+        first time the name is seen.
+
+        The instances depend on the path maps, so the cache is cleared by
+        Environment.reload().
+        """
+        return _cached_file_path(cls, filename)
+
+    @staticmethod
+    def cache_clear():
+        _cached_file_path.cache_clear()
+
     def as_local(self, quote=False):
         if quote:
             return urllib.quote(self.local)
@@ -289,16 +312,14 @@ class FilePath:
         return None
 
     def __eq__(self, other):
-        if isinstance(other, FilePath):
-            if other.as_local() == self.as_local():
-                return True
-        return False
+        if other is self:
+            return True
+        if not isinstance(other, FilePath):
+            return NotImplemented
+        return other.as_local() == self.as_local()
 
-    def __ne__(self, other):
-        if isinstance(other, FilePath):
-            if other.as_local() == self.as_local():
-                return False
-        return True
+    def __hash__(self):
+        return hash(self.as_local())
 
     def __add__(self, other):
         return self.as_local() + other
@@ -333,15 +354,23 @@ class RemoteFilePath(FilePath):
         return f
 
 
+@functools.lru_cache(maxsize=1024)
+def _cached_file_path(cls, filename):
+    return cls(filename)
+
+
 class Environment:
 
     @staticmethod
     def reload(options=opts.Options):
         options.set(vim.eval('g:vdebug_options'))
+        FilePath.cache_clear()
+        Keymapper._invalidate()
 
         if options.isset('debug_file'):
             log.Log.set_logger(log.FileLogger(
-                options.get('debug_file_level'), options.get('debug_file')))
+                options.get('debug_file_level'), options.get('debug_file'),
+                autoflush=False))
 
 
 class InputStream:
@@ -353,6 +382,5 @@ class InputStream:
     def probe():
         try:
             vim.eval("getchar(0)")
-            time.sleep(0.1)
         except vim.error as e:
             raise error.UserInterrupt()
@@ -187,3 +187,42 @@ class BreakpointTest(unittest.TestCase):
         self.assertRaisesRegex(vdebug.error.BreakpointError,\
                 re, vdebug.breakpoint.Breakpoint.parse, ui, args)
 
+
+class StoreTest(unittest.TestCase):
+    def test_clear_breakpoints_removes_signs_in_one_call(self):
+        ui = Mock()
+        api = Mock()
+        store = vdebug.breakpoint.Store()
+        store.api = api
+        file = vdebug.util.FilePath("/path/to/file")
+        bp1 = vdebug.breakpoint.LineBreakpoint(ui, file, 10)
+        bp2 = vdebug.breakpoint.LineBreakpoint(ui, file, 20)
+        tmp = vdebug.breakpoint.TemporaryLineBreakpoint(ui, file, 30)
+        for bp, dbg_id in ((bp1, 1), (bp2, 2), (tmp, 3)):
+            bp.set_debugger_id(dbg_id)
+            store.breakpoints[str(bp.get_id())] = bp
+
+        store.clear_breakpoints()
+
+        ui.remove_breakpoints.assert_called_once_with([bp1, bp2])
+        ui.remove_breakpoint.assert_not_called()
+        self.assertEqual(3, api.breakpoint_remove.call_count)
+        self.assertEqual({}, store.breakpoints)
+
+    def test_clear_breakpoints_keeps_earlier_removals_on_failure(self):
+        ui = Mock()
+        api = Mock()
+        api.breakpoint_remove.side_effect = [None, Exception("gone")]
+        store = vdebug.breakpoint.Store()
+        store.api = api
+        file = vdebug.util.FilePath("/path/to/file")
+        bp1 = vdebug.breakpoint.LineBreakpoint(ui, file, 10)
+        bp2 = vdebug.breakpoint.LineBreakpoint(ui, file, 20)
+        for bp, dbg_id in ((bp1, 1), (bp2, 2)):
+            bp.set_debugger_id(dbg_id)
+            store.breakpoints[str(bp.get_id())] = bp
+
+        self.assertRaises(Exception, store.clear_breakpoints)
+
+        ui.remove_breakpoints.assert_called_once_with([bp1])
+        self.assertEqual({str(bp2.get_id()): bp2}, store.breakpoints)
@@ -1,9 +1,20 @@
+import io
 import unittest
 import vdebug.connection
 
 class SocketMockError():
     pass
 
+class SocketMockRaw(io.RawIOBase):
+    def __init__(self,sock):
+        self.sock = sock
+
+    def readable(self):
+        return True
+
+    def readinto(self,buffer):
+        return self.sock.recv_into(buffer)
+
 class SocketMock():
     def __init__(self):
         self.response = []
@@ -33,6 +44,20 @@ class SocketMock():
             self.response.pop(0)
             return b''
 
+    def recv_into(self,buffer,nbytes=0):
+        if not self.response:
+            return 0
+        nbytes = nbytes or len(buffer)
+        ret = self.response.pop(0)
+        chars = b''.join(ret[0:nbytes])
+        if len(ret) > nbytes:
+            self.response.insert(0, ret[nbytes:])
+        buffer[0:len(chars)] = chars
+        return len(chars)
+
+    def makefile(self,mode,buffering=-1):
+        return io.BufferedReader(SocketMockRaw(self),buffering)
+
     def add_response(self,res):
         digitlist = []
         for i in str(res):
@@ -47,6 +72,9 @@ class SocketMock():
         self.last_msg.append( msg )
         return len(msg)
 
+    def sendall(self,msg):
+        self.last_msg.append( msg )
+
     def get_last_sent(self):
         last = self.last_msg
         self.last_msg = [];
@@ -89,6 +117,28 @@ class ConnectionTest(unittest.TestCase):
         response = self.conn.recv_msg()
         assert response == 'this is a longer message'
 
+    """
+    Test that consecutive messages are read from the buffered data.
+    """
+    def test_read_consecutive(self):
+        self.conn.sock.add_response(3)
+        self.conn.sock.add_response('foo')
+        self.conn.sock.add_response(6)
+        self.conn.sock.add_response('barbaz')
+
+        assert self.conn.recv_msg() == 'foo'
+        assert self.conn.recv_msg() == 'barbaz'
+
+    """
+    Test a message larger than the receive buffer.
+    """
+    def test_read_larger_than_buffer(self):
+        msg = 'x' * (self.conn.RECV_BUFFER_SIZE * 3 + 5)
+        self.conn.sock.add_response(len(msg))
+        self.conn.sock.add_response(msg)
+
+        assert self.conn.recv_msg() == msg
+
     """
     Test that an EOFError is raised if the socket appears to be closed.
     """
@@ -105,3 +155,11 @@ class ConnectionTest(unittest.TestCase):
         self.conn.send_msg(cmd)
         sent = self.conn.sock.get_last_sent()
         assert sent == cmd+'\0'
+
+    """
+    Test that send_msgs sends each command followed by a null byte.
+    """
+    def test_send_msgs(self):
+        self.conn.send_msgs(['cmd one', 'cmd two'])
+        sent = self.conn.sock.get_last_sent()
+        assert sent == 'cmd one\0cmd two\0'
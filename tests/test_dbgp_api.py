@@ -153,6 +153,88 @@ class ApiTest(unittest.TestCase):
         self.assertEqual(str(res),"iso-8859-1")
         self.assertEqual(res.is_supported(),1)
 
+    def test_send_batch_sends_once(self):
+        """Test that a batch of commands is sent in a single write, each
+        with its own transaction ID"""
+        self.p.conn.recv_msg.side_effect = [
+            self.feature_set_msg % 1, self.feature_set_msg % 2]
+        self.p.send_batch([('feature_set', '-n a -v 1', vdebug.dbgp.Response),
+                           ('feature_set', '-n b -v 2', vdebug.dbgp.Response)])
+        self.p.conn.send_msgs.assert_called_once_with(
+            ['feature_set -i 1 -n a -v 1', 'feature_set -i 2 -n b -v 2'])
+
+    def test_send_batch_orders_by_transaction_id(self):
+        """Test that batch responses are returned in command order, even
+        if they arrive out of order"""
+        self.p.conn.recv_msg.side_effect = [
+            self.feature_set_msg % 2, self.feature_set_msg % 1]
+        res = self.p.send_batch(
+            [('feature_set', '-n a -v 1', vdebug.dbgp.Response),
+             ('feature_set', '-n b -v 2', vdebug.dbgp.Response)])
+        self.assertEqual(res[0].get_cmd_args(), '-n a -v 1')
+        self.assertEqual(res[0].as_xml().get('transaction_id'), '1')
+        self.assertEqual(res[1].as_xml().get('transaction_id'), '2')
+
+    def test_send_cmd_flushes_log_before_reading(self):
+        """Test that buffered log messages are written out before waiting
+        for the debugger"""
+        calls = []
+        self.p.conn.recv_msg.side_effect = \
+            lambda: calls.append('recv') or self.feature_set_msg % 1
+        with patch('vdebug.log.Log.flush',
+                   MagicMock(side_effect=lambda: calls.append('flush'))):
+            self.p.feature_set('max_depth', 1)
+        self.assertEqual(['flush', 'recv'], calls)
+
+    def test_send_batch_unknown_transaction_id(self):
+        self.p.conn.recv_msg.side_effect = [self.feature_set_msg % 5]
+        self.assertRaises(vdebug.dbgp.ResponseError, self.p.send_batch,
+                          [('feature_set', '-n a -v 1', vdebug.dbgp.Response)])
+
+    def test_send_batch_reads_all_replies_before_raising(self):
+        """Test that an unexpected transaction ID is only raised once the
+        remaining replies have been read"""
+        self.p.conn.recv_msg.reset_mock()
+        self.p.conn.recv_msg.side_effect = [
+            self.feature_set_msg % 5, self.feature_set_msg % 2]
+        self.assertRaises(vdebug.dbgp.ResponseError, self.p.send_batch,
+                          [('feature_set', '-n a -v 1', vdebug.dbgp.Response),
+                           ('feature_set', '-n b -v 2', vdebug.dbgp.Response)])
+        self.assertEqual(2, self.p.conn.recv_msg.call_count)
+
+    def test_send_batch_skips_notify(self):
+        """Test that notify packets between responses are skipped"""
+        self.p.conn.recv_msg.side_effect = [
+            self.feature_set_msg % 1, self.notify_msg,
+            self.feature_set_msg % 2]
+        res = self.p.send_batch(
+            [('feature_set', '-n a -v 1', vdebug.dbgp.Response),
+             ('feature_set', '-n b -v 2', vdebug.dbgp.Response)])
+        self.assertEqual(res[0].as_xml().get('transaction_id'), '1')
+        self.assertEqual(res[1].as_xml().get('transaction_id'), '2')
+
+    def test_send_batch_single_quoted_transaction_id(self):
+        """Test that a single-quoted transaction ID is matched, reusing
+        the parsed tree"""
+        self.p.conn.recv_msg.side_effect = [
+            (self.feature_set_msg % 1).replace('"1"', "'1'")]
+        res = self.p.send_batch(
+            [('feature_set', '-n a -v 1', vdebug.dbgp.Response)])
+        self.assertIsNotNone(res[0].xml)
+        self.assertEqual(res[0].as_xml().get('transaction_id'), '1')
+
+    notify_msg = """<?xml version="1.0" encoding="iso-8859-1"?>
+        <notify xmlns="urn:debugger_protocol_v1"
+        xmlns:xdebug="https://xdebug.org/dbgp/xdebug"
+        name="breakpoint_resolved"><breakpoint type="line" resolved="resolved"
+        filename="file:///tmp/index.php" lineno="3" state="enabled"
+        hit_count="0" hit_value="0" id="10"></breakpoint></notify>"""
+
+    feature_set_msg = """<?xml version="1.0" encoding="iso-8859-1"?>
+        <response xmlns="urn:debugger_protocol_v1"
+        command="feature_set" transaction_id="%i" feature="max_depth"
+        success="1"></response>"""
+
 class apiInvalidInitTest(unittest.TestCase):
 
     init_msg = """<?xml version="1.0"
@@ -50,7 +50,18 @@ class ResponseTest(unittest.TestCase):
             code="5"><message><![CDATA[command is not available]]>
             </message></error></response>"""
         re = "command is not available"
-        self.assertRaisesRegex(vdebug.dbgp.DBGPError,re,vdebug.dbgp.Response,response,"","",Mock())
+        res = vdebug.dbgp.Response(response,"","",Mock())
+        self.assertRaisesRegex(vdebug.dbgp.DBGPError,re,res.raise_for_error)
+
+    def test_error_text_in_cdata_does_not_raise(self):
+        response = """<?xml version="1.0" encoding="iso-8859-1"?>
+            <response xmlns="urn:debugger_protocol_v1"
+            xmlns:xdebug="http://xdebug.org/dbgp/xdebug"
+            command="property_get" transaction_id="4"><property
+            name="$html" type="string"><![CDATA[<error>]]></property>
+            </response>"""
+        res = vdebug.dbgp.Response(response,"","",Mock())
+        self.assertIsNone(res.raise_for_error())
 
 class StatusResponseTest(unittest.TestCase):
     """Test the behaviour of the StatusResponse class."""
@@ -63,6 +74,37 @@ class StatusResponseTest(unittest.TestCase):
         res = vdebug.dbgp.StatusResponse(response,"","",Mock())
         assert str(res) == "starting"
 
+    def test_status_is_cached(self):
+        response = """<?xml version="1.0" encoding="iso-8859-1"?>
+            <response xmlns="urn:debugger_protocol_v1"
+            command="status" transaction_id="1" status="break"
+            reason="ok"></response>"""
+        res = vdebug.dbgp.StatusResponse(response,"","",Mock())
+        assert str(res) == "break"
+        res.as_xml().set("status", "changed")
+        assert str(res) == "break"
+
+    def test_status_without_parsing(self):
+        response = """<?xml version="1.0" encoding="iso-8859-1"?>
+            <response xmlns="urn:debugger_protocol_v1"
+            xmlns:xdebug="http://xdebug.org/dbgp/xdebug"
+            command="step_into" transaction_id="1" status="break"
+            reason="ok"><xdebug:message filename="file:///tmp/a.php"
+            lineno="3"></xdebug:message></response>"""
+        res = vdebug.dbgp.StatusResponse(response,"","",Mock())
+        res.raise_for_error()
+        assert str(res) == "break"
+        self.assertIsNone(res.xml)
+
+    def test_status_error_is_raised(self):
+        response = """<?xml version="1.0" encoding="iso-8859-1"?>
+            <response xmlns="urn:debugger_protocol_v1"
+            command="run" transaction_id="4"><error
+            code="5"><message><![CDATA[command is not available]]>
+            </message></error></response>"""
+        res = vdebug.dbgp.StatusResponse(response,"","",Mock())
+        self.assertRaises(vdebug.dbgp.DBGPError,res.raise_for_error)
+
 class FeatureResponseTest(unittest.TestCase):
     """Test the behaviour of the FeatureResponse class."""
     def test_feature_is_supported(self):
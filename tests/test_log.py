@@ -31,6 +31,11 @@ class LoggerTest(unittest.TestCase):
         self.logger.log(self.text, self.level-1)
         self.worker.assert_called_once_with(self.text, self.level-1)
 
+    def test_is_enabled(self):
+        self.assertTrue(self.logger.is_enabled(self.level))
+        self.assertTrue(self.logger.is_enabled(self.level-1))
+        self.assertFalse(self.logger.is_enabled(self.level+1))
+
     def test_time(self):
         with mock.patch('time.localtime',
                         mock.Mock(return_value=self.time_tuple)):
@@ -45,6 +50,30 @@ class LoggerTest(unittest.TestCase):
         self.assertEqual(string, expected)
 
 
+class LogTest(unittest.TestCase):
+
+    def tearDown(self):
+        vdebug.log.Log.loggers = {}
+
+    def test_is_enabled_without_loggers(self):
+        vdebug.log.Log.loggers = {}
+        self.assertFalse(vdebug.log.Log.is_enabled(vdebug.log.Logger.ERROR))
+
+    def test_is_enabled_uses_most_verbose_logger(self):
+        vdebug.log.Log.loggers = {
+            'a': vdebug.log.Logger(vdebug.log.Logger.ERROR),
+            'b': vdebug.log.Logger(vdebug.log.Logger.INFO)
+        }
+        self.assertTrue(vdebug.log.Log.is_enabled(vdebug.log.Logger.INFO))
+        self.assertFalse(vdebug.log.Log.is_enabled(vdebug.log.Logger.DEBUG))
+
+    def test_flush_flushes_all_loggers(self):
+        logger = mock.Mock()
+        vdebug.log.Log.loggers = {'a': logger}
+        vdebug.log.Log.flush()
+        logger.flush.assert_called_once_with()
+
+
 class WindowLoggerTest(unittest.TestCase):
 
     level = 1
@@ -105,6 +134,23 @@ class FileLoggerTest(unittest.TestCase):
             handle.write.assert_called_once()
             handle.flush.assert_called_once()
 
+    def test_log_without_autoflush(self):
+        logger = vdebug.log.FileLogger(self.level, self.filename,
+                                       autoflush=False)
+        handle = mock.Mock()
+        logger.f = handle
+        logger.log('text', vdebug.log.Logger.DEBUG)
+        handle.write.assert_called_once_with(mock.ANY)
+        handle.flush.assert_not_called()
+        logger.log('text', vdebug.log.Logger.ERROR)
+        handle.flush.assert_called_once_with()
+
+    def test_flush(self):
+        handle = mock.Mock()
+        self.logger.f = handle
+        self.logger.flush()
+        handle.flush.assert_called_once_with()
+
     def test_shutdown_without_file(self):
         with mock.patch(self.open_name, mock.mock_open()) as mocked_open:
             self.logger.shutdown()
@@ -1,5 +1,5 @@
 import unittest
-from vdebug.opts import Options,OptionsError
+from vdebug.opts import EMPTY_PATH_MAPS,Options,OptionsError
 
 class OptionsTest(unittest.TestCase):
 
@@ -48,3 +48,19 @@ class OptionsTest(unittest.TestCase):
     def test_get_raises_error(self):
         Options.set({'foo':"1", 'bar':"2"})
         self.assertRaises(OptionsError, Options.get,'something')
+
+    def test_sorted_path_maps(self):
+        Options.set({'path_maps': {'/a': '/x', '/a/b/c': '/y', '/a/b': '/z'}})
+        self.assertEqual((('/a/b/c', '/y'), ('/a/b', '/z'), ('/a', '/x')),
+                         Options.get_sorted_path_maps())
+
+    def test_sorted_path_maps_updated_on_overwrite(self):
+        Options.set({'path_maps': {}})
+        self.assertIs(EMPTY_PATH_MAPS, Options.get_sorted_path_maps())
+        Options.overwrite('path_maps', {'/remote': '/local'})
+        self.assertEqual((('/remote', '/local'),),
+                         Options.get_sorted_path_maps())
+
+    def test_sorted_path_maps_unset(self):
+        Options.set({'foo': "1"})
+        self.assertIs(EMPTY_PATH_MAPS, Options.get_sorted_path_maps())
@@ -0,0 +1,24 @@
+import unittest
+from vdebug.session import SessionHandler
+try:
+    from unittest.mock import MagicMock
+except ImportError:
+    from mock import MagicMock
+
+class SessionHandlerStatusTest(unittest.TestCase):
+    def setUp(self):
+        self.handler = SessionHandler(MagicMock(), MagicMock())
+
+    def test_status_without_listener(self):
+        self.assertEqual("inactive", self.handler.status())
+        self.assertEqual("vdebug(inactive)",
+                         self.handler.status_for_statusline())
+
+    def test_statusline_follows_status(self):
+        self.handler.listener = MagicMock()
+        self.handler.listener.status.return_value = "listening"
+        self.assertEqual("vdebug(listening)",
+                         self.handler.status_for_statusline())
+        self.handler.listener.status.return_value = "ready"
+        self.assertEqual("vdebug(ready)",
+                         self.handler.status_for_statusline())
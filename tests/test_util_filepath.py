@@ -1,6 +1,6 @@
 import unittest
 import vdebug.opts
-from vdebug.util import FilePath
+from vdebug.util import FilePath, LocalFilePath
 from vdebug.error import FilePathError
 
 class LocalFilePathTest(unittest.TestCase):
@@ -60,6 +60,19 @@ class LocalFilePathTest(unittest.TestCase):
         file2 = FilePath(filename)
         self.assertFalse(file1 != file2)
 
+    def test_eq_other_type(self):
+        filename = "/home/user/some/path"
+        file = FilePath(filename)
+        self.assertFalse(file == filename)
+        assert file != filename
+
+    def test_hash(self):
+        filename = "/home/user/some/path"
+        file1 = FilePath(filename)
+        file2 = FilePath(filename)
+        self.assertEqual(hash(file1), hash(file2))
+        self.assertEqual(1, len({file1, file2}))
+
     def test_add(self):
         filename = "/home/user/some/path"
         file = FilePath(filename)
@@ -208,3 +221,31 @@ class MismatchingSeparatorsTest(unittest.TestCase):
         filename = "/local2/path/to/file"
         file = FilePath(filename)
         self.assertEqual("file:///remote2/path/to/file",file.as_remote())
+
+class CachedFilePathTest(unittest.TestCase):
+    def setUp(self):
+        vdebug.opts.Options.set({'path_maps':{'/remote':'/local'}})
+        FilePath.cache_clear()
+
+    def tearDown(self):
+        FilePath.cache_clear()
+
+    def test_cached_returns_same_instance(self):
+        file = FilePath.cached("file:///remote/file.php")
+        self.assertIs(file, FilePath.cached("file:///remote/file.php"))
+        self.assertEqual("/local/file.php", file.as_local())
+
+    def test_cached_per_class(self):
+        file = FilePath.cached("/remote/file.php")
+        local_file = LocalFilePath.cached("/remote/file.php")
+        self.assertIsInstance(local_file, LocalFilePath)
+        self.assertEqual("/local/file.php", file.as_local())
+        self.assertEqual("/remote/file.php", local_file.as_local())
+
+    def test_cache_clear(self):
+        file = FilePath.cached("/remote/file.php")
+        vdebug.opts.Options.set({'path_maps':{'/remote':'/other'}})
+        FilePath.cache_clear()
+        new_file = FilePath.cached("/remote/file.php")
+        self.assertIsNot(file, new_file)
+        self.assertEqual("/other/file.php", new_file.as_local())
@@ -0,0 +1,71 @@
+import os
+import tempfile
+import unittest
+import vdebug.util
+try:
+    from unittest.mock import MagicMock, patch
+except ImportError:
+    from mock import MagicMock, patch
+
+class KeymapperTest(unittest.TestCase):
+    def setUp(self):
+        self.keymaps = {"step_over": "<F2>", "run": "<F5>"}
+        self.vimeval = MagicMock(
+            side_effect=lambda expr: self.keymaps
+            if expr == "g:vdebug_keymap" else ",")
+        vdebug.util.Keymapper._invalidate()
+
+    def tearDown(self):
+        vdebug.util.Keymapper._invalidate()
+
+    def test_instances_share_cached_keys(self):
+        with patch('vim.eval', self.vimeval):
+            first = vdebug.util.Keymapper()
+            second = vdebug.util.Keymapper()
+        self.assertEqual(2, self.vimeval.call_count)
+        self.assertEqual("<F5>", second.run_key())
+        self.assertIs(first.keymaps, second.keymaps)
+
+    def test_environment_reload_invalidates_keys(self):
+        with patch('vim.eval', self.vimeval):
+            vdebug.util.Keymapper()
+            vdebug.util.Environment.reload(
+                MagicMock(isset=MagicMock(return_value=False)))
+            self.vimeval.reset_mock()
+            vdebug.util.Keymapper()
+        self.assertEqual(2, self.vimeval.call_count)
+
+    def test_map_uses_cached_keys(self):
+        with patch('vim.eval', self.vimeval), patch('vim.command', create=True):
+            keymapper = vdebug.util.Keymapper()
+            keymapper._store_old_map = MagicMock()
+            self.vimeval.reset_mock()
+            keymapper.map()
+        self.vimeval.assert_not_called()
+
+    def test_reload_reads_keys_again(self):
+        with patch('vim.eval', self.vimeval), patch('vim.command', create=True):
+            keymapper = vdebug.util.Keymapper()
+            keymapper._store_old_map = MagicMock()
+            self.vimeval.reset_mock()
+            keymapper.reload()
+        self.assertEqual(2, self.vimeval.call_count)
+        self.assertEqual(",", keymapper.leader)
+
+    def test_store_old_map(self):
+        fd, path = tempfile.mkstemp()
+        os.write(fd, b"set nocompatible\n"
+                     b"nnoremap <silent> <F2> :echo 'old'<CR>\n"
+                     b"nnoremap <F3> :echo 'other'<CR>\n"
+                     b"  map <F2> :echo 'indented'<CR>\n"
+                     b"map <F2> :echo 'last'<CR>")
+        os.close(fd)
+        vimeval = MagicMock(side_effect=lambda expr: path
+                            if expr == "tempname()" else self.vimeval(expr))
+        with patch('vim.eval', vimeval), patch('vim.command', create=True):
+            keymapper = vdebug.util.Keymapper()
+            keymapper._store_old_map()
+        self.assertEqual(["nnoremap <silent> <F2> :echo 'old'<CR>",
+                          "map <F2> :echo 'last'<CR>"],
+                         keymapper.existing)
+        self.assertFalse(os.path.exists(path))